@@ -2,11 +2,8 @@
 # 3 4 9 10
 # 5 6 11 12 (End goal)
 
-for row in [0, 1, 2]: 
-    for col in [0, 1, 2, 3]:  
-        if col < 2:
-            num = row * 2 + col + 1
-        else: 
-            num = (row * 2 + col - 2) + 7
-        print(num, end=' ')
-    print()  
\ No newline at end of file
+import sys
+
+# Left pair counts up from 1, right pair from 7, two numbers per row
+rows = [f"{row*2 + 1} {row*2 + 2} {row*2 + 7} {row*2 + 8}" for row in range(3)]
+sys.stdout.write("\n".join(rows) + "\n")
@@ -3,15 +3,40 @@ import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 from spotipy.exceptions import SpotifyException
 import re
+import unicodedata
+import random
+import threading
+import functools
+import itertools
+import shelve
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # --- CONFIGURATION ---
 SCOPE = "user-library-read playlist-modify-public playlist-modify-private"
 
+# Number of Spotify requests kept in flight while fetching metadata
+MAX_WORKERS = 8
+
+# Client-side request budget shared by all workers (calls per period in seconds)
+RATE_LIMIT_CALLS = 20
+RATE_LIMIT_PERIOD = 1.0
+RETRY_JITTER = 1.0  # Max random extra wait after a 429, spreads out retries
+
+# On-disk cache of audio features and artist info, reused across runs.
+# Audio features never change; artist info (genres) is refetched once it expires.
+CACHE_FILE = "verse_or_vibe_cache"
+ARTIST_CACHE_TTL = 30 * 24 * 60 * 60  # 30 days, in seconds
+FEATURES_RETRY_TTL = 7 * 24 * 60 * 60  # Re-check a refused audio-features endpoint weekly
+
 # Playlist names to process (change these to match your playlists)
 SOURCE_PLAYLIST_NAME = "International Songs"  # Change this to process different playlist
 LYRICAL_PLAYLIST_NAME = f"{SOURCE_PLAYLIST_NAME} - 🎤 Lyrical"
 NON_LYRICAL_PLAYLIST_NAME = f"{SOURCE_PLAYLIST_NAME} - 🎵 Instrumental"
 
+# Only the track fields the classifier reads are requested from Spotify
+TRACK_FIELDS = "items(track(id,name,duration_ms,track_number,artists(id,name),album(name))),next,total"
+
 # --- ENHANCED DETECTION KEYWORDS ---
 # Strong indicators of instrumental music (international focus)
 STRONG_INSTRUMENTAL_KEYWORDS = [
@@ -90,65 +115,219 @@ VOCAL_PATTERNS = [
     r'\[.*vocals?\]'
 ]
 
+# Each pattern list compiled once into a single alternation.
+# Names are lowercased before matching, so no IGNORECASE is needed.
+INSTRUMENTAL_RE = re.compile("|".join(f"(?:{p})" for p in INSTRUMENTAL_PATTERNS))
+VOCAL_RE = re.compile("|".join(f"(?:{p})" for p in VOCAL_PATTERNS))
+
+# Folding table for track names: drops combining accents left by NFKD and maps
+# typographic quotes, dashes and CJK brackets to the ASCII forms the keywords use
+FOLD_TABLE = str.maketrans({
+    **{chr(code): None for code in range(0x0300, 0x0370)},
+    '‘': "'", '’': "'", '“': '"', '”': '"',
+    '‐': '-', '‑': '-', '–': '-', '—': '-',
+    '【': '[', '】': ']', '〔': '[', '〕': ']', '「': '"', '」': '"'
+})
+
+def fold_name(name):
+    """Lowercase a name and fold accents/punctuation so ASCII keywords match"""
+    if name.isascii():
+        return name.lower()
+    return unicodedata.normalize("NFKD", name).translate(FOLD_TABLE).lower()
+
+# Detector scoring, in integer half points (SCORE_SCALE per reported point)
+SCORE_SCALE = 2
+INSTRUMENTAL_SCORE = 3  # Instrumental above 1.5 points
+
+def compile_keywords(keywords):
+    """Compile a keyword list into one literal alternation (longest keywords first)"""
+    return re.compile("|".join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)))
+
+def first_matches(regex, text, limit=2):
+    """Return up to `limit` matched keywords, stopping the scan once found"""
+    return [m.group() for m in itertools.islice(regex.finditer(text), limit)]
+
+# Each keyword list scanned in a single pass instead of one `in` test per keyword
+STRONG_INSTRUMENTAL_RE = compile_keywords(STRONG_INSTRUMENTAL_KEYWORDS)
+MEDIUM_INSTRUMENTAL_RE = compile_keywords(MEDIUM_INSTRUMENTAL_KEYWORDS)
+STRONG_VOCAL_RE = compile_keywords(STRONG_VOCAL_KEYWORDS)
+INSTRUMENTAL_ARTIST_RE = compile_keywords(INSTRUMENTAL_ARTIST_TYPES)
+INSTRUMENTAL_GENRE_RE = compile_keywords(INSTRUMENTAL_GENRES)
+VOCAL_GENRE_RE = compile_keywords(VOCAL_GENRES)
+
+# --- CONSOLE OUTPUT ---
+# Fetch workers and the playlist fillers report while the main thread prints
+# progress; everything printed during those phases goes through one lock
+print_lock = threading.Lock()
+
+def log(message):
+    """Print one whole line, even when other threads are printing"""
+    with print_lock:
+        print(message)
+
 # --- RATE LIMIT HANDLER ---
+class RateLimiter:
+    """Sliding-window request pacing shared by every thread talking to Spotify"""
+    
+    def __init__(self, max_calls, period, jitter=0.0):
+        self.max_calls = max_calls
+        self.period = period
+        self.jitter = jitter
+        self._calls = deque()
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+    
+    def acquire(self):
+        """Block until a request slot is free and no 429 penalty is active"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                
+                if now >= self._blocked_until and len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                
+                wait = 0.0
+                if now < self._blocked_until:
+                    # Each held-back thread resumes at its own random point after the penalty
+                    wait = self._blocked_until - now + random.uniform(0, self.jitter)
+                if len(self._calls) >= self.max_calls:
+                    wait = max(wait, self._calls[0] + self.period - now)
+            time.sleep(wait)
+    
+    def penalize(self, retry_after):
+        """Hold back all threads until Spotify's Retry-After has passed"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+rate_limiter = RateLimiter(RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD, RETRY_JITTER)
+
 def safe_sp_call(callable_func, *args, **kwargs):
     """Handle Spotify API rate limits gracefully"""
     max_retries = 5
     retry_count = 0
     
     while retry_count < max_retries:
+        rate_limiter.acquire()
         try:
             return callable_func(*args, **kwargs)
         except SpotifyException as e:
             if e.http_status == 429:
-                retry_after = int(e.headers.get("Retry-After", 5))
-                print(f"⚠️ Rate limit hit. Waiting for {retry_after} seconds... (Attempt {retry_count + 1}/{max_retries})")
-                time.sleep(retry_after + 1)
+                retry_after = int((e.headers or {}).get("Retry-After", 5))
+                log(f"⚠️ Rate limit hit. Waiting for {retry_after} seconds... (Attempt {retry_count + 1}/{max_retries})")
+                rate_limiter.penalize(retry_after + 1)
                 retry_count += 1
             else:
-                print(f"❌ Spotify API error: {e}")
+                # 403/404 are expected for optional endpoints; callers report them
+                if e.http_status not in (403, 404):
+                    log(f"❌ Spotify API error: {e}")
                 raise e
     
     raise Exception("Rate limit exceeded maximum retries")
 
 # --- ENHANCED DETECTION FUNCTIONS ---
-def get_audio_features_batch(sp, track_ids):
-    """Get audio features for multiple tracks"""
-    features = {}
-    
-    for i in range(0, len(track_ids), 100):
-        batch = track_ids[i:i+100]
-        try:
-            batch_features = safe_sp_call(sp.audio_features, batch)
-            for track_id, feature in zip(batch, batch_features):
-                if feature:
-                    features[track_id] = feature
-        except Exception as e:
-            print(f"⚠️ Could not fetch audio features for batch: {e}")
-    
-    return features
+def iter_audio_features(sp, track_ids):
+    """Yield (track_id, features or None) for every track as soon as its batch is ready
+
+    All missing batches are requested up front and the cached tracks are
+    yielded while they are in flight; fetched batches follow in order, so
+    callers can work on early results instead of waiting for the whole playlist.
+    """
+    with shelve.open(CACHE_FILE) as cache:
+        cached_ids = []
+        missing = []
+        for track_id in dict.fromkeys(track_ids):
+            if f"features:{track_id}" in cache:
+                cached_ids.append(track_id)
+            else:
+                missing.append(track_id)
+        
+        # A 403/404 from an earlier run means the endpoint is off for this app
+        unavailable_since = cache.get("features_unavailable")
+        if unavailable_since and time.time() - unavailable_since < FEATURES_RETRY_TTL:
+            print("⚠️ Audio features are not available for this app - skipping them")
+            missing = []
+        
+        chunks = [missing[i:i+100] for i in range(0, len(missing), 100)]
+        endpoint_unavailable = threading.Event()
+        
+        def fetch(batch):
+            if endpoint_unavailable.is_set():
+                return batch, None
+            try:
+                return batch, safe_sp_call(sp.audio_features, batch)
+            except SpotifyException as e:
+                if e.http_status in (403, 404):  # Endpoint not available for this app
+                    endpoint_unavailable.set()
+                else:
+                    log(f"⚠️ Could not fetch audio features for batch: {e}")
+                return batch, None
+            except Exception as e:
+                log(f"⚠️ Could not fetch audio features for batch: {e}")
+                return batch, None
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            # Submit the fetches first so they run while the cached tracks are handled
+            results = executor.map(fetch, chunks)
+            
+            for track_id in cached_ids:
+                yield track_id, cache[f"features:{track_id}"]
+            
+            for batch, batch_features in results:
+                if batch_features is None:  # Failed batch: nothing cached, tracks go on without features
+                    for track_id in batch:
+                        yield track_id, None
+                    continue
+                
+                for track_id, feature in zip(batch, batch_features):
+                    # Features never change for a track, so misses (None) are cached too
+                    cache[f"features:{track_id}"] = feature
+                    yield track_id, feature
+        
+        if endpoint_unavailable.is_set():
+            cache["features_unavailable"] = time.time()
+            print("⚠️ Audio features are not available for this app - skipping them")
+        elif chunks:
+            cache.pop("features_unavailable", None)
 
 def get_artist_info_batch(sp, artist_ids):
-    """Get artist information for genre analysis"""
+    """Get artist information for genre analysis (expects unique ids), reusing cached results"""
     artist_info = {}
-    
-    # Remove duplicates while preserving order
-    unique_artist_ids = list(dict.fromkeys(artist_ids))
-    
-    for i in range(0, len(unique_artist_ids), 50):  # Spotify allows 50 artists per request
-        batch = unique_artist_ids[i:i+50]
-        try:
-            batch_artists = safe_sp_call(sp.artists, batch)
-            for artist in batch_artists['artists']:
-                if artist:
-                    artist_info[artist['id']] = artist
-        except Exception as e:
-            print(f"⚠️ Could not fetch artist info for batch: {e}")
+    now = time.time()
+    
+    with shelve.open(CACHE_FILE) as cache:
+        # Reuse artists fetched within the TTL (entries are (fetched_at, artist) tuples)
+        missing = []
+        for artist_id in artist_ids:
+            cached = cache.get(f"artist:{artist_id}")
+            if isinstance(cached, tuple) and now - cached[0] < ARTIST_CACHE_TTL:
+                artist_info[artist_id] = cached[1]
+            else:
+                missing.append(artist_id)
+        
+        # Spotify allows 50 artists per request
+        chunks = [missing[i:i+50] for i in range(0, len(missing), 50)]
+        
+        def fetch(batch):
+            try:
+                return safe_sp_call(sp.artists, batch)['artists']
+            except Exception as e:
+                log(f"⚠️ Could not fetch artist info for batch: {e}")
+                return []
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for batch_artists in executor.map(fetch, chunks):
+                for artist in batch_artists:
+                    if artist:
+                        artist_info[artist['id']] = artist
+                        cache[f"artist:{artist['id']}"] = (now, artist)
     
     return artist_info
 
-def analyze_audio_features(features):
-    """Analyze audio features to determine if track is likely instrumental"""
+def analyze_audio_features(features, collect_reasons=False):
+    """Analyze audio features to determine if track is likely instrumental (score in half points)"""
     if not features:
         return 0, []
     
@@ -158,29 +337,36 @@ def analyze_audio_features(features):
     # Speechiness analysis (most important for vocals vs instrumental)
     speechiness = features.get('speechiness', 0)
     if speechiness < 0.05:  # Very low speechiness = likely instrumental
-        score += 3
-        reasons.append(f"Very low speechiness ({speechiness:.3f}) - likely instrumental")
+        score += 6
+        if collect_reasons:
+            reasons.append(f"Very low speechiness ({speechiness:.3f}) - likely instrumental")
     elif speechiness < 0.1:  # Low speechiness = possibly instrumental
-        score += 2
-        reasons.append(f"Low speechiness ({speechiness:.3f}) - possibly instrumental")
+        score += 4
+        if collect_reasons:
+            reasons.append(f"Low speechiness ({speechiness:.3f}) - possibly instrumental")
     elif speechiness > 0.3:  # High speechiness = likely has vocals
-        score -= 3
-        reasons.append(f"High speechiness ({speechiness:.3f}) - likely has vocals")
+        score -= 6
+        if collect_reasons:
+            reasons.append(f"High speechiness ({speechiness:.3f}) - likely has vocals")
     elif speechiness > 0.15:  # Medium speechiness = possibly has vocals
-        score -= 1
-        reasons.append(f"Medium speechiness ({speechiness:.3f}) - possibly has vocals")
+        score -= 2
+        if collect_reasons:
+            reasons.append(f"Medium speechiness ({speechiness:.3f}) - possibly has vocals")
     
     # Instrumentalness analysis
     instrumentalness = features.get('instrumentalness', 0)
     if instrumentalness > 0.7:  # High confidence instrumental
-        score += 4
-        reasons.append(f"High instrumentalness ({instrumentalness:.3f}) - strong instrumental indicator")
+        score += 8
+        if collect_reasons:
+            reasons.append(f"High instrumentalness ({instrumentalness:.3f}) - strong instrumental indicator")
     elif instrumentalness > 0.5:  # Medium confidence instrumental
-        score += 2
-        reasons.append(f"Medium instrumentalness ({instrumentalness:.3f}) - likely instrumental")
+        score += 4
+        if collect_reasons:
+            reasons.append(f"Medium instrumentalness ({instrumentalness:.3f}) - likely instrumental")
     elif instrumentalness < 0.1:  # Low instrumentalness = likely has vocals
-        score -= 1
-        reasons.append(f"Low instrumentalness ({instrumentalness:.3f}) - likely has vocals")
+        score -= 2
+        if collect_reasons:
+            reasons.append(f"Low instrumentalness ({instrumentalness:.3f}) - likely has vocals")
     
     # Energy and valence patterns
     energy = features.get('energy', 0)
@@ -188,19 +374,28 @@ def analyze_audio_features(features):
     
     # Classical/ambient patterns (low energy, variable valence)
     if energy < 0.3:
-        score += 0.5
-        reasons.append(f"Low energy ({energy:.2f}) - classical/ambient pattern")
+        score += 1
+        if collect_reasons:
+            reasons.append(f"Low energy ({energy:.2f}) - classical/ambient pattern")
     
     # Danceability analysis
     danceability = features.get('danceability', 0)
     if danceability < 0.3 and energy < 0.4:
-        score += 1
-        reasons.append("Low danceability + energy - classical/meditative pattern")
+        score += 2
+        if collect_reasons:
+            reasons.append("Low danceability + energy - classical/meditative pattern")
     
     return score, reasons
 
-def analyze_genres(artist_info_list):
-    """Analyze artist genres to determine instrumental likelihood"""
+@functools.lru_cache(maxsize=None)
+def classify_genre(genre):
+    """Return (is_instrumental_genre, is_vocal_genre) for a lowercase genre name"""
+    is_instrumental = bool(INSTRUMENTAL_GENRE_RE.search(genre))
+    is_vocal = bool(VOCAL_GENRE_RE.search(genre))
+    return is_instrumental, is_vocal
+
+def analyze_genres(artist_info_list, collect_reasons=False):
+    """Analyze artist genres to determine instrumental likelihood (score in half points)"""
     if not artist_info_list:
         return 0, []
     
@@ -210,132 +405,177 @@ def analyze_genres(artist_info_list):
             all_genres.extend([genre.lower() for genre in artist_info['genres']])
     
     if not all_genres:
-        return 0, ["No genre information available"]
+        return 0, ["No genre information available"] if collect_reasons else []
     
     score = 0
     reasons = []
     
     # Check for instrumental genres
-    instrumental_matches = [genre for genre in all_genres if any(inst_genre in genre for inst_genre in INSTRUMENTAL_GENRES)]
+    instrumental_matches = [genre for genre in all_genres if classify_genre(genre)[0]]
     if instrumental_matches:
-        score += len(instrumental_matches) * 2
-        reasons.append(f"Instrumental genres found: {', '.join(instrumental_matches[:3])}...")
+        score += len(instrumental_matches) * 4
+        if collect_reasons:
+            reasons.append(f"Instrumental genres found: {', '.join(instrumental_matches[:3])}...")
     
     # Check for vocal genres
-    vocal_matches = [genre for genre in all_genres if any(vocal_genre in genre for vocal_genre in VOCAL_GENRES)]
+    vocal_matches = [genre for genre in all_genres if classify_genre(genre)[1]]
     if vocal_matches:
-        score -= len(vocal_matches)
-        reasons.append(f"Vocal genres found: {', '.join(vocal_matches[:3])}...")
+        score -= len(vocal_matches) * 2
+        if collect_reasons:
+            reasons.append(f"Vocal genres found: {', '.join(vocal_matches[:3])}...")
     
     return score, reasons
 
-def is_likely_instrumental_advanced(track, audio_features=None, artist_info_list=None):
+def is_likely_instrumental_advanced(track, audio_features=None, artist_info_list=None, collect_reasons=False):
     """
     Advanced instrumental detection using multiple sophisticated methods
     Returns: (is_instrumental, confidence_score, detailed_reasons)
+    detailed_reasons stays empty unless collect_reasons is True, which skips
+    building reason strings for tracks that are never displayed.
     """
-    track_name = track['name'].lower()
-    artist_names = [artist['name'].lower() for artist in track['artists']]
-    album_name = track['album']['name'].lower() if track.get('album') else ""
-    
+    # Fast path: extreme audio features decide on their own, skip the text analysis
+    if audio_features:
+        instrumentalness = audio_features.get('instrumentalness', 0)
+        if instrumentalness > 0.85:
+            reasons = [f"Very high instrumentalness ({instrumentalness:.3f}) - decided by audio features"] if collect_reasons else []
+            return True, 5, reasons
+        speechiness = audio_features.get('speechiness', 0)
+        if instrumentalness < 0.02 and speechiness > 0.15:
+            reasons = [f"Very low instrumentalness ({instrumentalness:.3f}) with speech ({speechiness:.3f}) - decided by audio features"] if collect_reasons else []
+            return False, -5, reasons
+    
+    track_name = fold_name(track['name'])
+    artist_names = [fold_name(artist['name']) for artist in track['artists']]
+    album_name = fold_name(track['album']['name']) if track.get('album') else ""
+    
+    # Scores are integers in half points
     total_score = 0
-    all_reasons = []
+    context_reasons = []
     
-    # 1. Strong keyword analysis
-    strong_instrumental_found = any(keyword in track_name for keyword in STRONG_INSTRUMENTAL_KEYWORDS)
-    if strong_instrumental_found:
-        total_score += 5
-        matching_keywords = [kw for kw in STRONG_INSTRUMENTAL_KEYWORDS if kw in track_name]
-        all_reasons.append(f"Strong instrumental keywords: {', '.join(matching_keywords[:2])}")
-    
-    # 2. Medium keyword analysis
-    medium_instrumental_found = any(keyword in track_name for keyword in MEDIUM_INSTRUMENTAL_KEYWORDS)
-    if medium_instrumental_found:
+    # 1. Album name analysis
+    if STRONG_INSTRUMENTAL_RE.search(album_name):
         total_score += 2
-        matching_keywords = [kw for kw in MEDIUM_INSTRUMENTAL_KEYWORDS if kw in track_name]
-        all_reasons.append(f"Medium instrumental keywords: {', '.join(matching_keywords[:2])}")
-    
-    # 3. Strong vocal keyword analysis (negative score)
-    strong_vocal_found = any(keyword in track_name for keyword in STRONG_VOCAL_KEYWORDS)
-    if strong_vocal_found:
-        total_score -= 4
-        matching_keywords = [kw for kw in STRONG_VOCAL_KEYWORDS if kw in track_name]
-        all_reasons.append(f"Strong vocal keywords: {', '.join(matching_keywords[:2])}")
-    
-    # 4. Pattern analysis
-    for pattern in INSTRUMENTAL_PATTERNS:
-        if re.search(pattern, track_name, re.IGNORECASE):
-            total_score += 3
-            all_reasons.append("Matches instrumental pattern")
-            break
+        if collect_reasons:
+            context_reasons.append("Album name suggests instrumental")
     
-    for pattern in VOCAL_PATTERNS:
-        if re.search(pattern, track_name, re.IGNORECASE):
-            total_score -= 3
-            all_reasons.append("Matches vocal pattern")
-            break
-    
-    # 5. Album name analysis
-    if any(keyword in album_name for keyword in STRONG_INSTRUMENTAL_KEYWORDS):
-        total_score += 1
-        all_reasons.append("Album name suggests instrumental")
-    
-    # 6. Artist name analysis
+    # 2. Artist name analysis
     for artist_name in artist_names:
-        if any(artist_type in artist_name for artist_type in INSTRUMENTAL_ARTIST_TYPES):
-            total_score += 2
-            all_reasons.append(f"Artist type suggests instrumental: {artist_name}")
+        if INSTRUMENTAL_ARTIST_RE.search(artist_name):
+            total_score += 4
+            if collect_reasons:
+                context_reasons.append(f"Artist type suggests instrumental: {artist_name}")
     
-    # 7. Audio features analysis
+    # 3. Audio features analysis
     if audio_features:
-        audio_score, audio_reasons = analyze_audio_features(audio_features)
+        audio_score, audio_reasons = analyze_audio_features(audio_features, collect_reasons)
         total_score += audio_score
-        all_reasons.extend(audio_reasons)
+        context_reasons.extend(audio_reasons)
     
-    # 8. Genre analysis
+    # 4. Genre analysis
     if artist_info_list:
-        genre_score, genre_reasons = analyze_genres(artist_info_list)
+        genre_score, genre_reasons = analyze_genres(artist_info_list, collect_reasons)
         total_score += genre_score
-        all_reasons.extend(genre_reasons)
+        context_reasons.extend(genre_reasons)
     
-    # 9. Duration analysis
+    # 5. Duration analysis (the long-track bonus needs the vocal keyword scan below)
     duration_ms = track.get('duration_ms', 0)
     duration_min = duration_ms / 60000
+    duration_reasons = []
     
     if duration_min < 0.5:  # Very short tracks (intros/outros)
-        total_score += 2
-        all_reasons.append(f"Very short duration ({duration_min:.1f}min) - likely intro/outro")
-    elif duration_min > 8 and not strong_vocal_found:  # Long tracks without vocal indicators
-        total_score += 1
-        all_reasons.append(f"Long duration ({duration_min:.1f}min) without vocal indicators")
+        total_score += 4
+        if collect_reasons:
+            duration_reasons.append(f"Very short duration ({duration_min:.1f}min) - likely intro/outro")
+    long_track = duration_min > 8
     
-    # 10. Track number analysis (first and last tracks are often instrumental)
+    # 6. Track number analysis (first and last tracks are often instrumental)
+    track_number_reasons = []
     track_number = track.get('track_number', 0)
     if track_number == 1 and 'intro' in track_name:
-        total_score += 1
-        all_reasons.append("First track with 'intro' in name")
+        total_score += 2
+        if collect_reasons:
+            track_number_reasons.append("First track with 'intro' in name")
+    
+    keyword_limit = 2 if collect_reasons else 1  # Matched keywords are only needed for reasons
+    all_reasons = []
+    
+    # 7. Strong keyword analysis
+    strong_instrumental_matches = first_matches(STRONG_INSTRUMENTAL_RE, track_name, keyword_limit)
+    if strong_instrumental_matches:
+        total_score += 10
+        if collect_reasons:
+            all_reasons.append(f"Strong instrumental keywords: {', '.join(strong_instrumental_matches)}")
+    
+    # 8. Medium keyword analysis
+    medium_instrumental_matches = first_matches(MEDIUM_INSTRUMENTAL_RE, track_name, keyword_limit)
+    if medium_instrumental_matches:
+        total_score += 4
+        if collect_reasons:
+            all_reasons.append(f"Medium instrumental keywords: {', '.join(medium_instrumental_matches)}")
+    
+    # 9. Strong vocal keyword analysis (negative score)
+    strong_vocal_matches = first_matches(STRONG_VOCAL_RE, track_name, keyword_limit)
+    if strong_vocal_matches:
+        total_score -= 8
+        if collect_reasons:
+            all_reasons.append(f"Strong vocal keywords: {', '.join(strong_vocal_matches)}")
+    
+    # 10. Pattern analysis
+    if INSTRUMENTAL_RE.search(track_name):
+        total_score += 6
+        if collect_reasons:
+            all_reasons.append("Matches instrumental pattern")
+    
+    if VOCAL_RE.search(track_name):
+        total_score -= 6
+        if collect_reasons:
+            all_reasons.append("Matches vocal pattern")
+    
+    if long_track and not strong_vocal_matches:  # Long tracks without vocal indicators
+        total_score += 2
+        if collect_reasons:
+            duration_reasons.append(f"Long duration ({duration_min:.1f}min) without vocal indicators")
+    
+    # Reasons keep the original order: name, context, duration, track number
+    all_reasons += context_reasons + duration_reasons + track_number_reasons
     
     # Decision logic with more nuanced thresholds
     confidence_level = abs(total_score)
-    is_instrumental = total_score > 1.5
+    is_instrumental = total_score > INSTRUMENTAL_SCORE
     
     # Adjust confidence based on how many different methods agreed
     method_count = len([r for r in all_reasons if not r.startswith("No ")])
     if method_count >= 3:
-        confidence_level += 0.5
+        confidence_level += 1
     
-    return is_instrumental, total_score, all_reasons
+    return is_instrumental, total_score / SCORE_SCALE, all_reasons
+
+@functools.lru_cache(maxsize=1)
+def get_user_playlists(sp):
+    """Map every playlist name of the current user to its id (all pages)"""
+    playlists = {}
+    results = safe_sp_call(sp.current_user_playlists, limit=50)
+    
+    while True:
+        for playlist in results['items']:
+            # Keep the first occurrence, like the old linear search did
+            playlists.setdefault(playlist['name'], playlist['id'])
+        if not results['next']:
+            break
+        results = safe_sp_call(sp.next, results)
+    
+    return playlists
+
+def classify_track(track, audio_features, artist_info, collect_reasons=False):
+    """Run the detector on a track using the prefetched features and artist info"""
+    track_features = audio_features.get(track['id'])
+    track_artist_info = [artist_info.get(artist['id']) for artist in track['artists']]
+    return is_likely_instrumental_advanced(track, track_features, track_artist_info, collect_reasons)
 
 def get_playlist_tracks(sp, playlist_name):
     """Get all tracks from a specific playlist"""
     try:
-        playlists = safe_sp_call(sp.current_user_playlists, limit=50)['items']
-        playlist_id = None
-        
-        for playlist in playlists:
-            if playlist['name'] == playlist_name:
-                playlist_id = playlist['id']
-                break
+        playlist_id = get_user_playlists(sp).get(playlist_name)
         
         if not playlist_id:
             print(f"❌ Playlist '{playlist_name}' not found!")
@@ -343,13 +583,19 @@ def get_playlist_tracks(sp, playlist_name):
         
         print(f"📋 Found playlist: {playlist_name}")
         
-        results = safe_sp_call(sp.playlist_tracks, playlist_id, limit=100)
+        # The first page tells us the total, the remaining pages are fetched in parallel
+        results = safe_sp_call(sp.playlist_tracks, playlist_id, limit=100, fields=TRACK_FIELDS)
         all_tracks = results['items']
+        offsets = range(len(all_tracks), results['total'], 100)
+        
+        def fetch(offset):
+            return safe_sp_call(sp.playlist_tracks, playlist_id, limit=100, offset=offset,
+                                fields=TRACK_FIELDS)['items']
         
-        while results['next']:
-            results = safe_sp_call(sp.next, results)
-            all_tracks.extend(results['items'])
-            print(f"   📥 Fetched {len(all_tracks)} tracks so far...")
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for items in executor.map(fetch, offsets):
+                all_tracks.extend(items)
+                log(f"   📥 Fetched {len(all_tracks)} tracks so far...")
         
         valid_tracks = [item['track'] for item in all_tracks if item['track']]
         print(f"🎵 Total tracks in playlist: {len(valid_tracks)}")
@@ -363,17 +609,17 @@ def get_playlist_tracks(sp, playlist_name):
 def get_or_create_playlist(sp, name, user_id, description=""):
     """Get existing playlist or create new one"""
     try:
-        playlists = safe_sp_call(sp.current_user_playlists, limit=50)['items']
-        for playlist in playlists:
-            if playlist['name'] == name:
-                print(f"📝 Found existing playlist: {name}")
-                return playlist['id']
+        playlist_id = get_user_playlists(sp).get(name)
+        if playlist_id:
+            print(f"📝 Found existing playlist: {name}")
+            return playlist_id
         
         print(f"🆕 Creating new playlist: {name}")
         new_playlist = safe_sp_call(sp.user_playlist_create, 
                                    user=user_id, 
                                    name=name, 
                                    description=description)
+        get_user_playlists.cache_clear()
         return new_playlist['id']
     
     except Exception as e:
@@ -383,7 +629,8 @@ def get_or_create_playlist(sp, name, user_id, description=""):
 def clear_playlist(sp, playlist_id):
     """Clear all tracks from a playlist"""
     try:
-        tracks = safe_sp_call(sp.playlist_tracks, playlist_id, limit=100)
+        tracks = safe_sp_call(sp.playlist_tracks, playlist_id, limit=100,
+                              fields="items(track(id)),next")
         all_track_ids = [item['track']['id'] for item in tracks['items'] if item['track']]
         
         while tracks['next']:
@@ -402,18 +649,18 @@ def clear_playlist(sp, playlist_id):
 def add_tracks_to_playlist(sp, playlist_id, track_ids, playlist_name):
     """Add tracks to playlist in chunks"""
     if not track_ids:
-        print(f"ℹ️ No tracks to add to {playlist_name}")
+        log(f"ℹ️ No tracks to add to {playlist_name}")
         return
     
-    print(f"➕ Adding {len(track_ids)} tracks to {playlist_name}...")
+    log(f"➕ Adding {len(track_ids)} tracks to {playlist_name}...")
     
     for i in range(0, len(track_ids), 100):
         chunk = track_ids[i:i+100]
         try:
             safe_sp_call(sp.playlist_add_items, playlist_id, chunk)
-            print(f"   📦 Added chunk {i//100 + 1} ({len(chunk)} tracks)")
+            log(f"   📦 Added chunk {i//100 + 1} to {playlist_name} ({len(chunk)} tracks)")
         except Exception as e:
-            print(f"❌ Error adding chunk: {e}")
+            log(f"❌ Error adding chunk: {e}")
 
 # --- MAIN FUNCTION ---
 def main():
@@ -444,61 +691,71 @@ def main():
         print("❌ No tracks found or playlist doesn't exist!")
         return
 
-    # Get audio features for all tracks
-    print("\n🎼 Fetching audio features...")
-    track_ids = [track['id'] for track in tracks]
-    audio_features = get_audio_features_batch(sp, track_ids)
-    print(f"✅ Got audio features for {len(audio_features)} tracks")
-
     # Get artist information for genre analysis
     print("\n👥 Fetching artist information...")
-    all_artist_ids = []
-    for track in tracks:
-        all_artist_ids.extend([artist['id'] for artist in track['artists']])
-    
+    all_artist_ids = {artist['id'] for track in tracks for artist in track['artists']}
     artist_info = get_artist_info_batch(sp, all_artist_ids)
     print(f"✅ Got artist info for {len(artist_info)} artists")
 
     # Classify tracks with advanced detection
-    print("\n🏷️ Classifying tracks with advanced detection methods...")
     lyrical_tracks = []
     instrumental_tracks = []
     uncertain_tracks = []
     
-    for i, track in enumerate(tracks, 1):
+    # Classify each distinct track once, even if the playlist repeats it
+    unique_tracks = {}
+    for track in tracks:
+        unique_tracks.setdefault(track['id'] or id(track), track)  # Local files have no id
+    
+    audio_features = {}
+    decisions = {}
+    
+    def classify(key, track):
         try:
-            track_features = audio_features.get(track['id'])
-            
-            # Get artist info for this track
-            track_artist_info = [artist_info.get(artist['id']) for artist in track['artists']]
+            # Reasons are skipped here and rebuilt only for the tracks shown below
+            is_instrumental, confidence, _ = classify_track(track, audio_features, artist_info)
             
-            is_instrumental, confidence, reasons = is_likely_instrumental_advanced(
-                track, track_features, track_artist_info
-            )
-            
-            track_info = {
+            decisions[key] = is_instrumental, {
                 'id': track['id'],
                 'name': track['name'],
                 'artist': ', '.join([artist['name'] for artist in track['artists']]),
                 'confidence': confidence,
-                'reasons': reasons[:3]  # Keep top 3 reasons for display
+                'track': track
             }
             
-            if is_instrumental:
-                instrumental_tracks.append(track_info)
-                if abs(confidence) < 2:  # Low confidence instrumental
-                    uncertain_tracks.append(track_info)
-            else:
-                lyrical_tracks.append(track_info)
-                if abs(confidence) < 2:  # Low confidence lyrical
-                    uncertain_tracks.append(track_info)
-            
             # Progress indicator
-            if i % 20 == 0:
-                print(f"   🔄 Processed {i}/{len(tracks)} tracks...")
+            if len(decisions) % 20 == 0:
+                log(f"   🔄 Processed {len(decisions)}/{len(unique_tracks)} tracks...")
                 
         except Exception as e:
-            print(f"⚠️ Error classifying track '{track.get('name', 'Unknown')}': {e}")
+            log(f"⚠️ Error classifying track '{track.get('name', 'Unknown')}': {e}")
+    
+    # Tracks are classified as their audio features arrive, overlapping with the fetch
+    print("\n🎼 Fetching audio features and classifying tracks with advanced detection methods...")
+    track_ids = [track['id'] for track in unique_tracks.values() if track['id']]
+    for track_id, features in iter_audio_features(sp, track_ids):
+        if features:
+            audio_features[track_id] = features
+        classify(track_id, unique_tracks[track_id])
+    
+    for key, track in unique_tracks.items():
+        if not track['id']:
+            classify(key, track)
+    print(f"✅ Got audio features for {len(audio_features)} tracks")
+    
+    # Map the decisions back onto the playlist order
+    for track in tracks:
+        decision = decisions.get(track['id'] or id(track))
+        if decision is None:
+            continue
+        
+        is_instrumental, track_info = decision
+        if is_instrumental:
+            instrumental_tracks.append(track_info)
+        else:
+            lyrical_tracks.append(track_info)
+        if abs(track_info['confidence']) < 2:  # Low confidence classification
+            uncertain_tracks.append(track_info)
 
     # Display detailed results
     print(f"\n📊 Advanced Classification Results:")
@@ -510,12 +767,16 @@ def main():
     print(f"\n🎵 Sample Instrumental Classifications:")
     for track in sorted(instrumental_tracks, key=lambda x: x['confidence'], reverse=True)[:3]:
         print(f"   • {track['name']} by {track['artist']}")
-        print(f"     Confidence: {track['confidence']:.1f} | Reasons: {', '.join(track['reasons'][:2])}")
+        # Reasons are only built for the samples that are shown
+        _, confidence, reasons = classify_track(track['track'], audio_features, artist_info, collect_reasons=True)
+        print(f"     Confidence: {confidence:.1f} | Reasons: {', '.join(reasons[:2])}")
 
     print(f"\n🎤 Sample Lyrical Classifications:")
     for track in sorted([t for t in lyrical_tracks if t['confidence'] < -1], key=lambda x: x['confidence'])[:3]:
         print(f"   • {track['name']} by {track['artist']}")
-        print(f"     Confidence: {track['confidence']:.1f} | Reasons: {', '.join(track['reasons'][:2])}")
+        # Reasons are only built for the samples that are shown
+        _, confidence, reasons = classify_track(track['track'], audio_features, artist_info, collect_reasons=True)
+        print(f"     Confidence: {confidence:.1f} | Reasons: {', '.join(reasons[:2])}")
 
     if uncertain_tracks:
         print(f"\n🤔 Low Confidence Classifications (please review manually):")
@@ -550,8 +811,14 @@ def main():
         lyrical_ids = [track['id'] for track in lyrical_tracks]
         instrumental_ids = [track['id'] for track in instrumental_tracks]
         
-        add_tracks_to_playlist(sp, lyrical_playlist_id, lyrical_ids, LYRICAL_PLAYLIST_NAME)
-        add_tracks_to_playlist(sp, instrumental_playlist_id, instrumental_ids, NON_LYRICAL_PLAYLIST_NAME)
+        # Fill both playlists at once; chunks within a playlist stay in order
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            jobs = [
+                executor.submit(add_tracks_to_playlist, sp, lyrical_playlist_id, lyrical_ids, LYRICAL_PLAYLIST_NAME),
+                executor.submit(add_tracks_to_playlist, sp, instrumental_playlist_id, instrumental_ids, NON_LYRICAL_PLAYLIST_NAME)
+            ]
+            for job in jobs:
+                job.result()
         
         print("\n✅ Advanced separation complete! Check your Spotify playlists:")
         print(f"   🎤 {LYRICAL_PLAYLIST_NAME}: {len(lyrical_tracks)} songs")
@@ -1,5 +1,14 @@
+import os
+import hashlib
+import re
+import random
 import time
+import shelve
+import threading
 import spotipy
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from spotipy.oauth2 import SpotifyOAuth
 from spotipy.exceptions import SpotifyException
 
@@ -8,22 +17,47 @@ SCOPE = "user-library-read playlist-modify-public playlist-modify-private"
 INDIAN_PLAYLIST_NAME = "🌏 Indian Songs"
 INTERNATIONAL_PLAYLIST_NAME = "🌍 International Songs"
 
+# Number of Spotify requests kept in flight while fetching artist genres
+MAX_WORKERS = 8
+# New artists collected across liked-songs pages before their genres are fetched
+GENRE_FETCH_ARTISTS = 50 * MAX_WORKERS
+# Tracks held back for a genre fetch before it is started early
+MAX_WAITING_TRACKS = 1000
+
+# Client-side request budget shared by all workers (calls per period in seconds)
+RATE_LIMIT_CALLS = 20
+RATE_LIMIT_PERIOD = 1.0
+RETRY_BACKOFF_CAP = 60  # Max seconds to back off when a 429 carries no Retry-After
+RETRY_JITTER = 1.0  # Max random extra wait after a 429, spreads out retries
+
+# Minimum seconds between progress lines while streaming liked songs
+PROGRESS_INTERVAL = 1.0
+
+# On-disk cache of artist genres, reused across runs until entries expire
+GENRE_CACHE_FILE = os.path.expanduser("~/.cultura_sort_cache")
+GENRE_CACHE_TTL = 30 * 24 * 60 * 60  # 30 days, in seconds
+
+# On-disk cache of per-track decisions, dropped when the keywords change or entries expire
+DECISION_CACHE_FILE = os.path.expanduser("~/.cultura_sort_decisions")
+DECISION_CACHE_TTL = 30 * 24 * 60 * 60  # 30 days, in seconds
+
 # Add more for more precise sorting
 # --- KEYWORDS ---
-INDIAN_LANG_KEYWORDS = [
+# Tuples so the keyword sets stay fixed once the matchers below are compiled from them
+INDIAN_LANG_KEYWORDS = (
     'hindi', 'kannada', 'telugu', 'tamil', 'malayalam', 'bengali', 'assamese', 'sanskrit',
     'punjabi', 'gujarati', 'marathi', 'odia', 'bhojpuri', 'urdu'
-]
+)
 
 # Add more for more precise sorting
-INDIAN_GENRE_KEYWORDS = [
+INDIAN_GENRE_KEYWORDS = (
     'sandalwood', 'bollywood', 'tollywood', 'kollywood', 'mollywood', 'devotional',
     'bhajan', 'qawwali', 'classical indian', 'carnatic', 'hindustani', 'raga',
     'ghazal', 'kirtan', 'mantra', 'fusion indian', 'indipop', 'filmi', 'sufi',
     'indian classical', 'indian folk', 'indian pop'
-]
+)
 # --- Add more for more precise sorting ---
-POPULAR_INDIAN_ARTISTS = [
+POPULAR_INDIAN_ARTISTS = (
     'a.r. rahman', 'ilaiyaraaja', 'shankar mahadevan', 'udit narayan',
     'lata mangeshkar', 'kishore kumar', 'anirudh ravichander', 'yuvan shankar raja',
     'harris jayaraj', 'vishal-shekhar', 'shankar-ehsaan-loy', 'amit trivedi',
@@ -35,88 +69,215 @@ POPULAR_INDIAN_ARTISTS = [
     'dr. rajkumar', 'rajkumar', 'rahat fateh ali khan', 'nusrat fateh ali khan',
     'mohammed rafi', 'mukesh', 'hemant kumar', 'manna dey', 'jagjit singh',
     'ghulam ali', 'hariharan', 'unni menon', 'kailash kher', 'sukhwinder singh'
-]
+)
 # Add more for more precise sorting
 # Additional keywords for better detection
-INDIAN_SONG_KEYWORDS = [
+INDIAN_SONG_KEYWORDS = (
     'bollywood', 'item number', 'playback', 'duet', 'sad version', 'unplugged',
     'qawwali', 'thumri', 'bhajan', 'aarti', 'shloka'
-]
+)
+
+def compile_keywords(keywords, whole_words=False):
+    """Compile a keyword list into one literal alternation (longest keywords first)"""
+    pattern = "|".join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True))
+    return re.compile(rf"\b(?:{pattern})\b" if whole_words else pattern)
+
+# Each keyword list matched in a single native scan instead of one `in` test per keyword.
+# Language and song keywords share one matcher since both apply to track and album names.
+# Artist names must match whole words ('rajkumar' should not hit 'rajkumara')
+INDIAN_ARTIST_RE = compile_keywords(POPULAR_INDIAN_ARTISTS, whole_words=True)
+# Exact artist names resolve with one hash lookup before any substring scan
+INDIAN_ARTIST_SET = frozenset(POPULAR_INDIAN_ARTISTS)
+INDIAN_GENRE_RE = compile_keywords(INDIAN_GENRE_KEYWORDS)
+INDIAN_TEXT_RE = compile_keywords(dict.fromkeys(INDIAN_LANG_KEYWORDS + INDIAN_SONG_KEYWORDS))
+# Hints that flag a non-matching track for the uncertain-classification debug output
+UNCERTAIN_HINT_RE = compile_keywords(('india', 'desi', 'bollywood'))
+
+# Fingerprint of the matchers (keyword lists and matching rules); cached
+# decisions made by other versions are ignored
+KEYWORDS_HASH = hashlib.sha1(repr((INDIAN_ARTIST_RE.pattern, INDIAN_GENRE_RE.pattern,
+                                   INDIAN_TEXT_RE.pattern)).encode()).hexdigest()
+
+# --- CONSOLE OUTPUT ---
+# Liked-song pages are prefetched on a worker thread during classification and
+# both playlists are filled in parallel, so those messages share a lock
+print_lock = threading.Lock()
+
+def log(message):
+    """Print a line without it running into another thread's output"""
+    with print_lock:
+        print(message)
 
 # --- RATE LIMIT HANDLER ---
+class RateLimiter:
+    """Sliding-window request pacing shared by every thread talking to Spotify"""
+    
+    def __init__(self, max_calls, period, jitter=0.0):
+        self.max_calls = max_calls
+        self.period = period
+        self.jitter = jitter
+        self._calls = deque()
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+    
+    def acquire(self):
+        """Block until a request slot is free and no 429 penalty is active"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                
+                if now >= self._blocked_until and len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                
+                wait = 0.0
+                if now < self._blocked_until:
+                    # Each held-back thread resumes at its own random point after the penalty
+                    wait = self._blocked_until - now + random.uniform(0, self.jitter)
+                if len(self._calls) >= self.max_calls:
+                    wait = max(wait, self._calls[0] + self.period - now)
+            time.sleep(wait)
+    
+    def penalize(self, retry_after):
+        """Hold back all threads until Spotify's Retry-After has passed"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+rate_limiter = RateLimiter(RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD, RETRY_JITTER)
+
 def safe_sp_call(callable_func, *args, **kwargs):
     """Handle Spotify API rate limits gracefully"""
     max_retries = 5
     retry_count = 0
     
     while retry_count < max_retries:
+        rate_limiter.acquire()
         try:
             return callable_func(*args, **kwargs)
         except SpotifyException as e:
             if e.http_status == 429:  # Rate limit exceeded
-                retry_after = int(e.headers.get("Retry-After", 5))
-                print(f"⚠️ Rate limit hit. Waiting for {retry_after} seconds... (Attempt {retry_count + 1}/{max_retries})")
-                time.sleep(retry_after + 1)
+                # Honour Retry-After when given, otherwise back off exponentially
+                retry_after = int((e.headers or {}).get("Retry-After", 0)) or min(RETRY_BACKOFF_CAP, 2 ** retry_count)
+                log(f"⚠️ Rate limit hit. Waiting for {retry_after} seconds... (Attempt {retry_count + 1}/{max_retries})")
+                rate_limiter.penalize(retry_after)
                 retry_count += 1
             elif e.http_status == 401:  # Unauthorized
-                print("❌ Authentication failed. Please check your credentials.")
+                log("❌ Authentication failed. Please check your credentials.")
                 raise e
             else:
-                print(f"❌ Spotify API error: {e}")
+                log(f"❌ Spotify API error: {e}")
                 raise e
     
-    print("❌ Max retries exceeded. Please try again later.")
+    log("❌ Max retries exceeded. Please try again later.")
     raise Exception("Rate limit exceeded maximum retries")
 
 # --- ENHANCED DETECTION FUNCTIONS ---
-def is_indian_track(track, sp):
-    """Enhanced Indian track detection with multiple criteria"""
+def get_artist_genres(sp, artist_ids):
+    """Fetch lowercase genres for many artists, using the on-disk cache and batched requests"""
+    artist_genres = {}
+    now = time.time()
+    
+    with shelve.open(GENRE_CACHE_FILE) as cache:
+        # Use cached genres while they are fresh, collect the rest for fetching
+        missing = []
+        for artist_id in artist_ids:
+            if not artist_id:  # Local files have artists without an id
+                continue
+            cached = cache.get(artist_id)
+            if cached and now - cached[0] < GENRE_CACHE_TTL:
+                artist_genres[artist_id] = cached[1]
+            else:
+                missing.append(artist_id)
+        
+        def fetch(chunk):
+            try:
+                return safe_sp_call(sp.artists, chunk)['artists']
+            except Exception as e:
+                log(f"⚠️ Could not fetch genres for artist batch: {e}")
+                return []
+        
+        # Spotify allows 50 artists per request; keep several batches in flight
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for artists in executor.map(fetch, chunkify(missing, 50)):
+                for artist in artists:
+                    if artist:
+                        genres = [genre.lower() for genre in artist.get('genres', [])]
+                        artist_genres[artist['id']] = genres
+                        cache[artist['id']] = (now, genres)
     
-    # Check artist names
-    artist_names = [artist['name'].lower() for artist in track['artists']]
-    artist_match = any(any(indian_artist in name for indian_artist in POPULAR_INDIAN_ARTISTS) for name in artist_names)
+    return artist_genres
+
+def get_cached_decision(decisions, track_id, now):
+    """Return the stored is_indian decision for a track, or None if unknown or stale"""
+    cached = decisions.get(track_id) if track_id else None
+    if cached and cached[1] == KEYWORDS_HASH and now - cached[0] < DECISION_CACHE_TTL:
+        return cached[2]
+    return None
+
+def has_indian_keywords(track):
+    """Cheap name-based checks that need no genre lookup"""
+    # Most known artists are credited under exactly their listed name
+    if any(artist['name'].lower() in INDIAN_ARTIST_SET for artist in track['artists']):
+        return True
     
-    # Check track name for language keywords
-    track_name = track['name'].lower()
-    lang_match = any(lang in track_name for lang in INDIAN_LANG_KEYWORDS)
+    # Join track, album and artist names into one newline-separated buffer;
+    # each matcher scans only its own region, so every character is read once
+    album_name = track['album']['name'] if track.get('album') else ''
+    names = f"{track['name']}\n{album_name}".lower()
+    artist_names = '\n'.join(artist['name'] for artist in track['artists']).lower()
+    haystack = f"{names}\n{artist_names}"
     
-    # Check track name for Indian song keywords
-    song_keyword_match = any(keyword in track_name for keyword in INDIAN_SONG_KEYWORDS)
+    # Language / Indian song keywords in track and album names, then artist names
+    return bool(INDIAN_TEXT_RE.search(haystack, 0, len(names))
+                or INDIAN_ARTIST_RE.search(haystack, len(names) + 1))
+
+def report_uncertain(track):
+    """Debug output for negatives whose title still hints at India"""
+    if UNCERTAIN_HINT_RE.search(track['name'].lower()):
+        log(f"🤔 Uncertain classification: {track['name']} by {', '.join([a['name'] for a in track['artists']])}")
+
+def is_indian_track(track, artist_genres, keyword_match=None):
+    """Enhanced Indian track detection; keyword_match may carry a precomputed has_indian_keywords result"""
     
-    # Check genres (with error handling)
-    genre_match = False
-    try:
-        artist_id = track['artists'][0]['id']
-        artist = safe_sp_call(sp.artist, artist_id)
-        genres = [genre.lower() for genre in artist.get('genres', [])]
-        genre_match = any(any(indian_genre in genre for indian_genre in INDIAN_GENRE_KEYWORDS) for genre in genres)
-    except Exception as e:
-        print(f"⚠️ Could not fetch genre for artist: {e}")
+    # Cheapest checks first; the genre lookup is only needed when they all fail
+    if keyword_match is None:
+        keyword_match = has_indian_keywords(track)
+    if keyword_match:
+        return True
     
-    # Check album name for Indian keywords
-    album_match = False
-    if 'album' in track and track['album']:
-        album_name = track['album']['name'].lower()
-        album_match = any(keyword in album_name for keyword in INDIAN_LANG_KEYWORDS + INDIAN_SONG_KEYWORDS)
+    # Check genres of the main artist (prefetched in batches)
+    main_artist_id = track['artists'][0]['id'] if track['artists'] else None
+    genres = artist_genres.get(main_artist_id, [])
+    if INDIAN_GENRE_RE.search('\n'.join(genres)):
+        return True
     
-    # Return True if any criteria matches
-    is_indian = artist_match or lang_match or genre_match or song_keyword_match or album_match
+    report_uncertain(track)
+    return False
+
+def get_user_playlists(sp):
+    """Map every playlist name of the current user to its id (all pages)"""
+    playlists = {}
+    results = safe_sp_call(sp.current_user_playlists, limit=50)
     
-    # Debug output for uncertain cases
-    if not is_indian and any(keyword in track_name for keyword in ['india', 'desi', 'bollywood']):
-        print(f"🤔 Uncertain classification: {track['name']} by {', '.join([a['name'] for a in track['artists']])}")
+    while True:
+        for playlist in results['items']:
+            # Keep the first occurrence, like the old linear search did
+            playlists.setdefault(playlist['name'], playlist['id'])
+        if not results['next']:
+            break
+        results = safe_sp_call(sp.next, results)
     
-    return is_indian
+    return playlists
 
-def get_or_create_playlist(sp, name, user_id, description=""):
-    """Get existing playlist or create new one"""
+def get_or_create_playlist(sp, name, user_id, playlists, description=""):
+    """Get existing playlist from the name map or create new one"""
     try:
         # Check existing playlists
-        playlists = safe_sp_call(sp.current_user_playlists, limit=50)['items']
-        for playlist in playlists:
-            if playlist['name'] == name:
-                print(f"📝 Found existing playlist: {name}")
-                return playlist['id']
+        if name in playlists:
+            print(f"📝 Found existing playlist: {name}")
+            return playlists[name]
         
         # Create new playlist if not found
         print(f"🆕 Creating new playlist: {name}")
@@ -124,23 +285,30 @@ def get_or_create_playlist(sp, name, user_id, description=""):
                                    user=user_id, 
                                    name=name, 
                                    description=description)
+        playlists[name] = new_playlist['id']
         return new_playlist['id']
     
     except Exception as e:
         print(f"❌ Error with playlist '{name}': {e}")
         raise e
 
+def get_playlist_track_ids(sp, playlist_id):
+    """Get the ids of all tracks currently in a playlist (all pages)"""
+    tracks = safe_sp_call(sp.playlist_tracks, playlist_id, limit=100, fields="items(track(id)),next")
+    all_track_ids = [item['track']['id'] for item in tracks['items'] if item['track']]
+    
+    # Handle pagination
+    while tracks['next']:
+        tracks = safe_sp_call(sp.next, tracks)
+        all_track_ids.extend([item['track']['id'] for item in tracks['items'] if item['track']])
+    
+    return all_track_ids
+
 def clear_playlist(sp, playlist_id):
     """Clear all tracks from a playlist"""
     try:
         # Get current tracks
-        tracks = safe_sp_call(sp.playlist_tracks, playlist_id, limit=100)
-        all_track_ids = [item['track']['id'] for item in tracks['items'] if item['track']]
-        
-        # Handle pagination
-        while tracks['next']:
-            tracks = safe_sp_call(sp.next, tracks)
-            all_track_ids.extend([item['track']['id'] for item in tracks['items'] if item['track']])
+        all_track_ids = get_playlist_track_ids(sp, playlist_id)
         
         # Remove tracks in chunks
         if all_track_ids:
@@ -151,18 +319,22 @@ def clear_playlist(sp, playlist_id):
     except Exception as e:
         print(f"⚠️ Warning: Could not clear playlist: {e}")
 
-def chunkify(lst, size):
-    """Split list into chunks of specified size"""
-    for i in range(0, len(lst), size):
-        yield lst[i:i + size]
+def chunkify(items, size):
+    """Split any iterable into lists of specified size"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
 
 def add_tracks_to_playlist(sp, playlist_id, track_ids, playlist_name):
     """Add tracks to playlist in chunks with progress tracking"""
     if not track_ids:
-        print(f"ℹ️ No tracks to add to {playlist_name}")
+        log(f"ℹ️ No tracks to add to {playlist_name}")
         return
     
-    print(f"➕ Adding {len(track_ids)} tracks to {playlist_name}...")
+    log(f"➕ Adding {len(track_ids)} tracks to {playlist_name}...")
     
     chunk_count = 0
     total_chunks = (len(track_ids) + 99) // 100  # Ceiling division
@@ -171,11 +343,26 @@ def add_tracks_to_playlist(sp, playlist_id, track_ids, playlist_name):
         chunk_count += 1
         try:
             safe_sp_call(sp.playlist_add_items, playlist_id, chunk)
-            print(f"   📦 Added chunk {chunk_count}/{total_chunks} ({len(chunk)} tracks)")
+            log(f"   📦 Added chunk {chunk_count}/{total_chunks} to {playlist_name} ({len(chunk)} tracks)")
         except Exception as e:
-            print(f"❌ Error adding chunk {chunk_count}: {e}")
+            log(f"❌ Error adding chunk {chunk_count}: {e}")
 
 # --- MAIN FUNCTION ---
+def iter_saved_track_pages(sp):
+    """Yield the user's liked songs one page (50 items) at a time
+    
+    The next page is requested in the background while the caller is
+    still working on the current one.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        results = safe_sp_call(sp.current_user_saved_tracks, limit=50)
+        while True:
+            next_page = executor.submit(safe_sp_call, sp.next, results) if results['next'] else None
+            yield results['items']
+            if next_page is None:
+                return
+            results = next_page.result()
+
 def main():
     """Main execution function"""
     
@@ -197,46 +384,96 @@ def main():
         print(f"❌ Failed to authenticate with Spotify: {e}")
         return
 
-    # Fetch all liked songs
-    print("\n🔍 Fetching your liked songs...")
+    # Stream liked songs page by page. Tracks settled by the decision cache, their
+    # names or already known genres are classified right away; the rest wait until
+    # their unknown artists fill a parallel genre fetch.
+    print("\n🔍 Fetching and classifying your liked songs...")
+    artist_genres = {}
+    seen = set()
+    total_songs = 0
+    cached_count = 0
+    now = time.time()
+    last_progress = time.monotonic()
+    results = []  # [track_id, is_indian] in liked-songs order; None while waiting or on error
+    waiting = []  # (result slot, track, keyword match) for tracks waiting on genres
+    pending_artists = {}  # Artist ids still needing genres, insertion-ordered
+    
+    def classify(slot, track, keyword_match, decisions):
+        """Classify one track into its result slot and remember the decision"""
+        try:
+            is_indian = is_indian_track(track, artist_genres, keyword_match)
+            # Don't remember negatives whose genre lookup failed
+            main_artist_id = track['artists'][0]['id'] if track['artists'] else None
+            if track['id'] and (is_indian or main_artist_id in artist_genres):
+                decisions[track['id']] = (now, KEYWORDS_HASH, is_indian)
+            slot[1] = is_indian
+        except Exception as e:
+            log(f"⚠️ Error classifying track '{track.get('name', 'Unknown')}': {e}")
+    
+    def classify_waiting(decisions):
+        """Fetch genres for the waiting tracks' artists, then classify those tracks"""
+        if pending_artists:
+            artist_genres.update(get_artist_genres(sp, list(pending_artists)))
+            pending_artists.clear()
+        for slot, track, keyword_match in waiting:
+            classify(slot, track, keyword_match, decisions)
+        waiting.clear()
+    
     try:
-        results = safe_sp_call(sp.current_user_saved_tracks, limit=50)
-        all_tracks = results['items']
-        
-        # Handle pagination
-        while results['next']:
-            results = safe_sp_call(sp.next, results)
-            all_tracks.extend(results['items'])
-            print(f"   📥 Fetched {len(all_tracks)} songs so far...")
-        
-        print(f"🎵 Total liked songs found: {len(all_tracks)}")
+        with shelve.open(DECISION_CACHE_FILE) as decisions:
+            for page in iter_saved_track_pages(sp):
+                total_songs += len(page)
+                
+                for item in page:
+                    track = item['track']
+                    if not track:  # Skip if track is None (deleted tracks)
+                        continue
+                    
+                    # Skip tracks already classified (pagination can return duplicates)
+                    if track['id'] in seen:
+                        continue
+                    seen.add(track['id'])
+                    
+                    # Reuse decisions from earlier runs
+                    slot = [track['id'], get_cached_decision(decisions, track['id'], now)]
+                    results.append(slot)
+                    if slot[1] is not None:
+                        cached_count += 1
+                        if not slot[1]:
+                            report_uncertain(track)
+                        continue
+                    
+                    # Only tracks the names don't settle need their artist's genres
+                    keyword_match = has_indian_keywords(track)
+                    main_artist_id = track['artists'][0]['id'] if track['artists'] else None
+                    if keyword_match or not main_artist_id or main_artist_id in artist_genres:
+                        classify(slot, track, keyword_match, decisions)
+                    else:
+                        pending_artists[main_artist_id] = None
+                        waiting.append((slot, track, keyword_match))
+                
+                # Enough new artists for every worker to fetch a 50-artist batch,
+                # or enough tracks held back to bound memory
+                if len(pending_artists) >= GENRE_FETCH_ARTISTS or len(waiting) >= MAX_WAITING_TRACKS:
+                    classify_waiting(decisions)
+                
+                # Progress indicator, throttled so fast (cached) pages don't flood the console
+                if time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+                    log(f"   🔄 Fetched {total_songs} songs so far...")
+                    last_progress = time.monotonic()
+            
+            classify_waiting(decisions)
         
     except Exception as e:
         print(f"❌ Error fetching liked songs: {e}")
         return
-
-    # Classify tracks
-    print("\n🏷️ Classifying tracks as Indian or International...")
-    indian_tracks = []
-    international_tracks = []
     
-    for i, item in enumerate(all_tracks, 1):
-        track = item['track']
-        if not track:  # Skip if track is None (deleted tracks)
-            continue
-            
-        try:
-            if is_indian_track(track, sp):
-                indian_tracks.append(track['id'])
-            else:
-                international_tracks.append(track['id'])
-                
-            # Progress indicator
-            if i % 50 == 0:
-                print(f"   🔄 Processed {i}/{len(all_tracks)} tracks...")
-                
-        except Exception as e:
-            print(f"⚠️ Error classifying track '{track.get('name', 'Unknown')}': {e}")
+    indian_tracks = [track_id for track_id, is_indian in results if is_indian]
+    international_tracks = [track_id for track_id, is_indian in results if is_indian is False]
+    
+    print(f"🎵 Total liked songs found: {total_songs}")
+    print(f"👥 Got genres for {len(artist_genres)} artists")
+    print(f"💾 Reused {cached_count} cached decisions")
 
     print(f"\n📊 Classification Results:")
     print(f"   🇮🇳 Indian tracks: {len(indian_tracks)}")
@@ -245,21 +482,30 @@ def main():
     # Create/get playlists
     print("\n📝 Setting up playlists...")
     try:
+        playlists = get_user_playlists(sp)
         indian_playlist_id = get_or_create_playlist(
-            sp, INDIAN_PLAYLIST_NAME, user_id, 
+            sp, INDIAN_PLAYLIST_NAME, user_id, playlists,
             "Auto-generated playlist containing Indian songs from your liked music"
         )
         international_playlist_id = get_or_create_playlist(
-            sp, INTERNATIONAL_PLAYLIST_NAME, user_id,
+            sp, INTERNATIONAL_PLAYLIST_NAME, user_id, playlists,
             "Auto-generated playlist containing International songs from your liked music"
         )
         
         # Ask user if they want to clear existing playlists
         clear_playlists = input("\n🤔 Do you want to clear existing playlists before adding? (y/N): ").lower().startswith('y')
         
+        indian_to_add = indian_tracks
+        international_to_add = international_tracks
         if clear_playlists:
             clear_playlist(sp, indian_playlist_id)
             clear_playlist(sp, international_playlist_id)
+        else:
+            # Only add tracks the playlists don't already contain
+            existing = set(get_playlist_track_ids(sp, indian_playlist_id))
+            indian_to_add = [tid for tid in indian_tracks if tid not in existing]
+            existing = set(get_playlist_track_ids(sp, international_playlist_id))
+            international_to_add = [tid for tid in international_tracks if tid not in existing]
         
     except Exception as e:
         print(f"❌ Error setting up playlists: {e}")
@@ -268,8 +514,14 @@ def main():
     # Add tracks to playlists
     print("\n🎯 Adding tracks to playlists...")
     try:
-        add_tracks_to_playlist(sp, indian_playlist_id, indian_tracks, INDIAN_PLAYLIST_NAME)
-        add_tracks_to_playlist(sp, international_playlist_id, international_tracks, INTERNATIONAL_PLAYLIST_NAME)
+        # Fill both playlists at once; chunks within a playlist stay in order
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            jobs = [
+                executor.submit(add_tracks_to_playlist, sp, indian_playlist_id, indian_to_add, INDIAN_PLAYLIST_NAME),
+                executor.submit(add_tracks_to_playlist, sp, international_playlist_id, international_to_add, INTERNATIONAL_PLAYLIST_NAME)
+            ]
+            for job in jobs:
+                job.result()
         
         print("\n✅ Sorting complete! Check your Spotify playlists:")
         print(f"   🇮🇳 {INDIAN_PLAYLIST_NAME}: {len(indian_tracks)} songs")